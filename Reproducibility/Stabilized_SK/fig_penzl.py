@@ -15,7 +15,7 @@ def penzl2(X):
 	A3 = np.array([[-1, 400], [-400,-1]])
 	A4 = -np.diag(np.arange(1, 1001))
 
-	H = np.zeros(len(X), dtype = np.complex)
+	H = np.zeros(len(X), dtype = np.complex128)
 	for i, x in tqdm.tqdm(enumerate(X), total = len(X)):
 		z = x[0]
 		p = x[1]
@@ -14,7 +14,7 @@ def penzl3(X):
 
 	A4 = -np.diag(np.arange(1, 1001))
 
-	H = np.zeros(len(X), dtype = np.complex)
+	H = np.zeros(len(X), dtype = np.complex128)
 	for i, x in tqdm.tqdm(enumerate(X), total = len(X)):
 		z = x[0]
 		p1 = x[1]
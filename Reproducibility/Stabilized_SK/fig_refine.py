@@ -52,7 +52,7 @@ for name, X, y in data:
 		
 		delta_a[k] = np.linalg.norm(a0 - a1)
 		delta_b[k] = np.linalg.norm(b0 - b1)
-		J = _rational_jacobian_complex(np.hstack([a1,b1]).astype(np.complex).view(float),sk.P, sk.Q)
+		J = _rational_jacobian_complex(np.hstack([a1,b1]).astype(np.complex128).view(float),sk.P, sk.Q)
 		s = np.linalg.svd(J, compute_uv = False)
 		print("sing", s)
 		conds[k] = s[0]/s[-3]
@@ -24,6 +24,9 @@ class PolynomialBasis(abc.ABC):
 	r"""An abstract base class for polynomial bases.
 	"""
 
+	# True if vandermonde accepts a preallocated output buffer via out
+	_vandermonde_out = False
+
 	def __init__(self, X, degree):
 		r"""
 		
@@ -1,6 +1,6 @@
 import warnings
 import numpy as np
-from scipy.linalg import eig, eigvals, hessenberg
+from scipy.linalg import eig, get_lapack_funcs
 from .basis import PolynomialBasis
 from .polynomial import Polynomial
 
@@ -9,6 +9,59 @@ try:
 except ImportError:
 	from backports.cached_property import cached_property
 
+# Numba is an optional dependency (pip install polyrat[numba]) used only for
+# the Lagrange Vandermonde kernel; compiled kernels are cached on disk,
+# but the first call in a fresh environment pays a few seconds of JIT time
+try:
+	from numba import njit, prange
+	_has_numba = True
+except ImportError:
+	_has_numba = False
+	prange = range
+	def njit(*args, **kwargs):
+		if len(args) == 1 and callable(args[0]):
+			return args[0]
+		return lambda func: func
+
+
+def _assemble_pencil(nodes, weights, coef):
+	r""" Build the balanced matrix C0 of the Lagrange companion pencil
+
+	Returns the matrix C0 from [LC14]_ after scaling, balancing, and rotating
+	the first weight to be real and positive along with a flag indicating if this rotation succeeded.
+	The inputs must share a common dtype, which is also the dtype of C0.
+	"""
+	n = len(nodes)
+	C0 = np.zeros((n+1, n+1), dtype=coef.dtype)
+
+	# scaling; a zero (or overflowing) norm would fill the pencil with NaNs
+	coef_norm = np.linalg.norm(coef)
+	weights_norm = np.linalg.norm(weights)
+	if not (0 < coef_norm < np.inf and 0 < weights_norm < np.inf):
+		raise ValueError("array must not contain infs or NaNs")
+	coef = coef / coef_norm
+	weights = weights / weights_norm
+
+	# balancing [LC14, eq. 29]
+	s = np.ones(n+1)
+	mask = np.abs(coef) > 0
+	s[1:][mask] = np.sqrt(np.abs(weights[mask]/coef[mask]))
+
+	# Equivalent to diag(1/s) C0 diag(s): only the first row and column are off-diagonal
+	np.fill_diagonal(C0[1:,1:], nodes)
+	C0[0,1:] = coef * s[1:]
+	C0[1:,0] = weights / s[1:]
+
+	# Apply a rotation to make the first weight real and positive;
+	# the phase conj(z)/|z| is real for real input, preserving the dtype
+	z = C0[1,0]
+	absz = np.abs(z)
+	rotated = np.isfinite(absz)
+	if rotated and absz > 0:
+		C0[1:,0] *= np.conj(z)/absz
+
+	return C0, rotated
+
 
 def lagrange_roots(nodes, weights, coef, deflation = True):
 	r""" Compute the roots of a Lagrange polynomial
@@ -42,80 +95,93 @@ def lagrange_roots(nodes, weights, coef, deflation = True):
 	"""
 	n = len(nodes)
 	assert (n == len(weights)) and  (n == len(coef)), "Dimensions of nodes, weights, and coef should be the same"
+	if not (np.all(np.isfinite(nodes)) and np.all(np.isfinite(weights)) and np.all(np.isfinite(coef))):
+		raise ValueError("array must not contain infs or NaNs")
+
+	# Work in real arithmetic when possible, as the real LAPACK routines are cheaper;
+	# the eigenvalues are still returned as complex numbers
+	if np.isrealobj(nodes) and np.isrealobj(weights) and np.isrealobj(coef):
+		dtype = np.float64
+	else:
+		dtype = np.complex128
 
-	
 	# Build the RHS of the generalized eigenvalue problem
-	C0 = np.zeros((n+1, n+1), dtype=complex)
-	C0[1:n+1,1:n+1] = np.diag(nodes)
+	C0, rotated = _assemble_pencil(np.asarray(nodes, dtype=dtype), 
+		np.asarray(weights, dtype=dtype), np.asarray(coef, dtype=dtype))
 
 	# LHS for generalized eigenvalue problem	
-	C1 = np.eye(n+1, dtype=complex)
+	C1 = np.eye(n+1, dtype=dtype)
 	C1[0, 0] = 0
 
-	# scaling
-	coef = coef / np.linalg.norm(coef)
-	weights = weights / np.linalg.norm(weights)
-
-	C0[0,1:n+1] = coef
-	C0[1:n+1,0] = weights
-
-
-	# balancing [LC14, eq. 29]
-	coef0 = np.copy(coef)
-	weights0 = np.copy(weights)
-	s = np.array([1.]+[np.sqrt(np.abs(wj/aj)) if np.abs(aj) > 0 else 1 for (wj, aj) in zip(weights, coef)])
-	C0 = np.diag(1/s) @ C0 @ np.diag(s)
-
-	# Apply a rotation to make the first weight real
-	angle = np.angle(C0[1,0])
-	if np.isfinite(angle):
-		C0[1:,0] *= np.exp(-1j*angle)
-	else:
-		print("Rotation failed", angle)
+	if not rotated:
+		print("Rotation failed", C0[1,0])
 		deflation = False
 
 	if deflation:
 		#C0[1,0] must be real for Householder to reflect correctly
 		assert np.abs(C0[1,0].imag) < 1e-10, "C0[1,0]: %g + I %g" % (C0[1,0].real, C0[1,0].imag)
-		#Householder Reflector
+		#Householder Reflector H = I - beta u u^*
 		u = np.copy(C0[1:,0]) # = w scaled
 		u[0] += np.linalg.norm(C0[1:,0]) # (w) scaled
-		H = np.eye(n, dtype=complex) - 2 * np.outer(u,u.conjugate())/(np.linalg.norm(u)**2)
-		G2 = np.zeros((n+1, n+1), dtype=complex)
-		G2[0,0] = 1
-		G2[1:,1:] = H
-		C0 = G2 @ C0 @ G2
-		C1 = G2 @ C1 @ G2
-		H1, P1 = hessenberg(C0[1:,1:], calc_q=True, overwrite_a = False)
-		G3 = np.zeros((n+1, n+1), dtype=complex)
-		G3[0,0] = 1
-		G3[1:,1:] = P1.T.conjugate()
-		G4 = np.eye(n+1, dtype=complex)
-		G4[0:2,0:2] = [[0,1],[1,0]]
-		H1 = G4.dot(G3.dot(C0.dot(G3.T.conjugate())))[1:,1:]
-		B1 = G4.dot(G3.dot(C1.dot(G3.T.conjugate())))[1:,1:]
-
-		# Givens Rotation
-		G5 = np.eye(n, dtype=complex)
-		a = H1[0,0]
-		b = H1[1,0]
-		c = a / np.sqrt(a**2 + b**2)
-		s = b / np.sqrt(a**2 + b**2)
-		G5[0:2,0:2] = [[c.conjugate(), s.conjugate()],[-s,c]]
-
-		H2 = G5.dot(H1)[1:,1:]
-		B2 = G5.dot(B1)[1:,1:]
-		try:
-			return eigvals(H2, B2)
-		except np.linalg.linalg.LinAlgError as e:
-			raise e 
+		beta = 2/np.vdot(u, u).real
+		# Apply the similarity transform diag(1, H) C0 diag(1, H) without forming H
+		larf, = get_lapack_funcs(('larf',), (C0,))
+		work = np.empty(n+1, dtype=C0.dtype)
+		C0[1:,:] = larf(u, beta, C0[1:,:], work, side = 'L')
+		C0[:,1:] = larf(u, beta, C0[:,1:], work, side = 'R')
+		# As H is Hermitian and unitary, diag(1, H) C1 diag(1, H) = C1
+
+		# Hessenberg reduction C0[1:,1:] = P1 H P1^* with P1 kept in packed form
+		if np.iscomplexobj(C0):
+			gehrd, unmqr = get_lapack_funcs(('gehrd', 'unmqr'), (C0,))
+		else:
+			gehrd, unmqr = get_lapack_funcs(('gehrd', 'ormqr'), (C0,))
+		Hq, tau, info = gehrd(C0[1:,1:], overwrite_a = True)
+		if info != 0:
+			raise ValueError("illegal value in %d-th argument of internal gehrd" % -info)
+		# Under diag(1, P1^*) C0 diag(1, P1) only the first row changes,
+		# as the first column is a multiple of e_1 and P1 = diag(1, P2).
+		# The reflectors of P2 are stored in QR form in Hq[1:,:-1].
+		r = np.copy(C0[0,1:])
+		if n > 1:
+			rQ, work, info = unmqr('R', 'N', Hq[1:,:-1], tau, r[None,1:], n, overwrite_c = True)
+			if info != 0:
+				raise ValueError("illegal value in %d-th argument of internal unmqr" % -info)
+			r[1:] = rQ[0]
+		# Swap the first two rows and drop the first row and column;
+		# the corresponding block of C1 is diag(0, 1, ..., 1)
+		H1 = np.triu(Hq, -1)
+		H1[0] = r
+
+		# Givens Rotation [c, s; -conj(s), c] zeroing H1[1,0]
+		lartg, = get_lapack_funcs(('lartg',), (H1,))
+		c, s, _ = lartg(H1[0,0], H1[1,0])
+
+		# The rotation only mixes the first two rows and the first row is then dropped,
+		# so only the second row needs to be updated
+		H2 = H1[1:,1:].copy()
+		H2[0] = -np.conj(s) * H1[0,1:] + c * H1[1,1:]
+		
+		# H2 is upper Hessenberg and the rotation maps diag(0, 1, ..., 1) to B2 = diag(c, 1, ..., 1).
+		# SciPy does not expose the QZ iteration (hgeqz) for such a reduced pair; 
+		# instead, unless c is small, we solve the equivalent standard eigenvalue problem for B2^{-1} H2,
+		# which is several times cheaper than QZ.  This trades accuracy for speed:
+		# scaling the first row by 1/c amplifies errors by up to 1/|c| <= 10,
+		# so while typical errors match QZ, the worst case can be several times larger.
+		# H2 and B2 are freshly constructed and finite, so skip the copy and finiteness check
+		if np.abs(c) >= 0.1:
+			H2[0] /= c
+			return eig(H2, right = False, overwrite_a = True, check_finite = False)
+		B2 = np.eye(n-1, dtype=dtype)
+		B2[0,0] = c
+		return eig(H2, B2, right = False, overwrite_a = True, overwrite_b = True, check_finite = False)
 	else:
 		# Compute the eigenvalues
 		# As this eigenvalue problem has a double root at infinity, we ignore the division by zero warning
 		with warnings.catch_warnings():
 			warnings.filterwarnings("ignore", message='divide by zero encountered in true_divide',
 									category=RuntimeWarning)
-			ew = eigvals(C0, C1, overwrite_a=False)
+			ew = eig(C0, C1, right = False, overwrite_a = True, overwrite_b = True, check_finite = False)
 		ew = ew[np.isfinite(ew).flatten()]
 		assert len(ew) == len(coef) - 1, "Error: too many infinite eigenvalues encountered"
 
@@ -123,18 +189,75 @@ def lagrange_roots(nodes, weights, coef, deflation = True):
 
 
 
-def lagrange_vandermonde(nodes, weights, X):
+@njit(parallel = True, cache = True, error_model = 'numpy')
+def _lagrange_vandermonde_numba(x, nodes, weights, dX, prepared, V):
+	r""" Fill V with the barycentric Lagrange Vandermonde matrix; see :func:`lagrange_vandermonde`
+
+	If prepared is True, the differences are read from dX rather than recomputed.
+	"""
+	m, n = V.shape
+	for i in prange(m):
+		on_node = False
+		for j in range(n):
+			# Numba raises on complex division by zero, so check explicitly
+			if prepared:
+				d = dX[i,j]
+			else:
+				d = x[i] - nodes[j]
+			if d == 0:
+				on_node = True
+				break
+			V[i,j] = weights[j] / d
+			if not np.isfinite(V[i,j]):
+				on_node = True
+				break
+
+		if on_node:
+			# x coincides with a node, so this row is the corresponding unit vector
+			k = np.argmin(np.abs(x[i] - nodes))
+			V[i,:] = 0
+			V[i,k] = 1.
+		else:
+			V[i,:] /= np.sum(V[i,:])
+	return V
+
+
+def lagrange_vandermonde(nodes, weights, X, dX = None, out = None):
 	r""" Build the Vandermonde matrix associated with 
+
+	If provided, dX holds the precomputed differences X.flatten()[:,None] - nodes
+	and out is an array of matching shape and dtype into which the result is written.
 	"""
 	x = X.flatten()
 	assert len(x) == len(X), "Input must be one dimensional"
+	dtype = np.result_type(x, nodes, weights, 1.)
+
+	if out is None:
+		out = np.empty((len(x), len(nodes)), dtype = dtype)
+	assert out.shape == (len(x), len(nodes)) and out.dtype == dtype, "Output buffer has the wrong shape or dtype"
+
+	if _has_numba:
+		prepared = dX is not None
+		if prepared:
+			dX = dX.astype(dtype, copy = False)
+		else:
+			dX = np.empty((0, 0), dtype = dtype)
+		return _lagrange_vandermonde_numba(x.astype(dtype, copy = False), nodes.astype(dtype, copy = False), 
+			weights.astype(dtype, copy = False), dX, prepared, out)
 
 	with np.errstate(divide = 'ignore', invalid = 'ignore'):
-		# The columns of the Vandermonde matrix 
-		V = np.array([w/(x - n) for n, w in zip(nodes, weights)]).T
-		for row in np.argwhere(~np.all(np.isfinite(V), axis = 1)):
-			V[row] = 0
-			V[row, np.argmin(np.abs(x[row] - nodes)).flatten()] = 1.
+		# The columns of the Vandermonde matrix, built in a single buffer 
+		if dX is None:
+			V = np.subtract(x[:,None], nodes, dtype = dtype, out = out)
+			np.reciprocal(V, out = V)
+		else:
+			V = np.reciprocal(dX, dtype = dtype, out = out)
+		np.multiply(V, weights, out = V)
+		# Rows where x coincides with a node are replaced by the corresponding unit vector
+		bad = np.flatnonzero(~np.all(np.isfinite(V), axis = 1))
+		idx = np.argmin(np.abs(x[bad,None] - nodes), axis = 1)
+		V[bad] = 0
+		V[bad, idx] = 1.
 		
 		denom = np.sum(V, axis = 1)
 		V /= denom[:, None]
@@ -163,15 +286,28 @@ class LagrangePolynomialBasis(PolynomialBasis):
 		List of the nodes :math:`\xi_j` specifying the basis.
 
 	"""
+	_vandermonde_out = True
+
 	def __init__(self, nodes):
 		self.nodes = np.array(nodes).flatten()
 		assert len(nodes) == len(self.nodes), "Input must be one-dimensional"
 
 		# BT 04, eq. (3.2)
 		# w[j] = prod_{j\ne k} 1./(node[j] - node[k])
-		self.weights = 1./np.array([
-			np.prod(self.nodes[k] - self.nodes[0:k]) * np.prod(self.nodes[k] - self.nodes[k+1:]) for k in range(len(self.nodes))
-			])
+		D = self.nodes[:,None] - self.nodes[None,:]
+		np.fill_diagonal(D, 1.)
+		if len(self.nodes) > 200:
+			# Accumulate magnitudes in log-space to avoid overflow/underflow in the product
+			absD = np.abs(D)
+			self.weights = np.prod(absD/D, axis = 1) * np.exp(-np.sum(np.log(absD), axis = 1))
+		else:
+			self.weights = 1./np.prod(D, axis = 1)
+
+		# These arrays are shared between shallow copies of the basis
+		self.nodes.flags.writeable = False
+		self.weights.flags.writeable = False
+
+		self._prepared = (None, None)
 
 	@property
 	def dim(self):
@@ -181,8 +317,21 @@ class LagrangePolynomialBasis(PolynomialBasis):
 	def vandermonde_X(self):
 		return np.eye(len(nodes))
 
-	def vandermonde(self, X):
-		return lagrange_vandermonde(self.nodes, self.weights, X)
+	def prepare(self, X):
+		r""" Precompute the differences between X and the nodes
+
+		Subsequent calls to :meth:`vandermonde` with this same array X reuse these differences;
+		modifying X in-place after calling this method will return stale values.
+		"""
+		dX = X.flatten()[:,None] - self.nodes
+		dX.flags.writeable = False
+		self._prepared = (X, dX)
+
+	def vandermonde(self, X, out = None):
+		X_prepared, dX = self._prepared
+		if X is not X_prepared:
+			dX = None
+		return lagrange_vandermonde(self.nodes, self.weights, X, dX = dX, out = out)
 
 	def vandermonde_derivative(self, X):
 		raise NotImplementedError
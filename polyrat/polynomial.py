@@ -1,7 +1,8 @@
 import abc
 import numpy as np
 from .basis import *
-from copy import deepcopy
+from copy import copy
+from collections import OrderedDict
 import scipy.linalg
 import cvxpy as cp
 from .util import _zeros
@@ -18,19 +19,75 @@ class Polynomial:
 		Coefficients corresponding the ordered basis elements.
 	"""
 	def __init__(self, basis, coef):
-		self.basis = deepcopy(basis)
+		# Bases are not modified after construction, so a shallow copy suffices
+		self.basis = copy(basis)
 		self.coef = np.copy(coef)
 
+	_vandermonde_cache_size = 4
+
+	def __getstate__(self):
+		# The Vandermonde cache is keyed on ids that do not survive copying or pickling
+		state = self.__dict__.copy()
+		state.pop('_vandermonde_cache', None)
+		return state
+
 	def __call__(self, X):
+		r""" Evaluate the polynomial at X; see :meth:`eval`
+		"""
 		return self.eval(X)
 
 	@property
 	def degree(self):
 		return self.basis.degree	
 
-	def eval(self, X):
+	def _vandermonde(self, X):
+		r""" Vandermonde matrix of the basis at X, memoized on the identity of X
+
+		The most recently used matrices are cached keyed on the identity, shape, and dtype of X.
+		References to X and the basis are held with each entry so their ids cannot be reused,
+		and a hash of the contents of X is checked on each hit so that an array modified in-place is recomputed.
+		When the cache is full, the evicted matrix is reused as the output buffer if it has the same size.
+		"""
+		if not isinstance(X, np.ndarray):
+			return self.basis.vandermonde(X)
+
+		try:
+			cache = self._vandermonde_cache
+		except AttributeError:
+			cache = self._vandermonde_cache = OrderedDict()
+
+		key = (id(X), id(self.basis), X.shape, X.dtype)
+		# Hashing the contents is O(M), far cheaper than building the Vandermonde matrix
+		fingerprint = hash(X.tobytes())
+		workspace = None
+		if key in cache:
+			cache.move_to_end(key)
+			if cache[key][-2] == fingerprint:
+				return cache[key][-1]
+			# X was modified in-place; recompute into the stale matrix
+			workspace = cache.pop(key)[-1]
+
+		while len(cache) >= self._vandermonde_cache_size:
+			X_old, basis_old, _, V_old = cache.popitem(last = False)[1]
+			if basis_old is self.basis and X_old.shape == X.shape and X_old.dtype == X.dtype:
+				workspace = V_old
+
+		if workspace is not None and self.basis._vandermonde_out:
+			V = self.basis.vandermonde(X, out = workspace)
+		else:
+			V = self.basis.vandermonde(X)
+		cache[key] = (X, self.basis, fingerprint, V)
+		return V
+
+	def eval(self, X, out = None):
+		r""" Evaluate the polynomial at X
+
+		The Vandermonde matrix of the most recent inputs is cached,
+		so repeated evaluation at the same array X is cheap;
+		modifying X in-place between calls is detected and the matrix is recomputed.
+		"""
 		#return self.basis.vandermonde(X) @ self.coef
-		return np.einsum('ij,j...->i...', self.basis.vandermonde(X), self.coef)
+		return np.einsum('ij,j...->i...', self._vandermonde(X), self.coef, out = out)
 
 	def derivative(self, X):
 		r""" Compute the derivative 
@@ -44,6 +44,7 @@ setup(name='polyrat',
 	author_email = 'jeffrey@hokanson.us',
 	packages = ['polyrat',],
 	install_requires = install_requires,
+	extras_require = {'numba': ['numba']},
 	test_requires = test_requires,
 	python_requires='>=3.6',
 	classifiers = [
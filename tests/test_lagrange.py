@@ -64,6 +64,179 @@ def test_wilkinson(n, ang, deflate):
 	assert rel_err < 1e-10, "Error in evaluating Vandermonde matrix"
 
 
+@pytest.mark.parametrize("n", [10, 300])
+def test_weights(n):
+	r""" Check barycentric weights against the closed form for Chebyshev points
+
+	For Chebyshev points of the second kind the weights are, up to a common scaling,
+	:math:`(-1)^j \delta_j` where :math:`\delta_j = 1/2` at the endpoints and one otherwise [BT04]_.
+	"""
+	X = np.cos(np.pi*np.arange(n+1)/n)
+	basis = LagrangePolynomialBasis(X)
+	
+	weights_true = (-1.)**np.arange(n+1)
+	weights_true[[0,-1]] *= 0.5
+	weights = basis.weights/basis.weights[0]*weights_true[0]
+	err = np.max(np.abs(weights - weights_true))
+	print(err)
+	assert err < 1e-10, "Barycentric weights inaccurate"
+
+
+@pytest.mark.parametrize("complex_", [True, False])
+def test_pencil_dtype(complex_, monkeypatch):
+	r""" The pencil is assembled in real arithmetic for real data and complex otherwise
+	"""
+	import polyrat.lagrange
+	assemble_pencil = polyrat.lagrange._assemble_pencil
+	dtypes = []
+	def spy(*args):
+		C0, rotated = assemble_pencil(*args)
+		dtypes.append(C0.dtype)
+		return C0, rotated
+	monkeypatch.setattr(polyrat.lagrange, '_assemble_pencil', spy)
+
+	n = 10
+	X = np.arange(n, dtype = float)
+	y = np.cos(X)
+	if complex_:
+		X = X*(1+1j)
+		y = y + 1j*np.sin(X)
+	basis = LagrangePolynomialBasis(X)
+	roots = lagrange_roots(basis.nodes, basis.weights, y)
+	assert len(roots) == n - 1
+	assert dtypes == [np.complex128 if complex_ else np.float64]
+
+
+@pytest.mark.parametrize("n", [5, 10, 20])
+@pytest.mark.parametrize("deflate", [True, False])
+def test_real_roots(n, deflate):
+	r""" Real data uses real arithmetic; check it agrees with the complex computation
+	"""
+	np.random.seed(0)
+	X = np.cos(np.pi*np.arange(n)/(n-1))
+	y = np.random.randn(n)
+	basis = LagrangePolynomialBasis(X)
+
+	roots_real = lagrange_roots(basis.nodes, basis.weights, y, deflate)
+	roots_complex = lagrange_roots(basis.nodes.astype(complex), basis.weights.astype(complex), y.astype(complex), deflate)
+	err = sorted_norm(roots_real, roots_complex, np.inf)
+	print(err)
+	assert err < 1e-10, "Real and complex roots disagree"
+
+
+@pytest.mark.parametrize("deflate", [True, False])
+def test_nonfinite(deflate):
+	r""" Non-finite data must raise rather than reach LAPACK
+	"""
+	basis = LagrangePolynomialBasis(np.linspace(-1, 1, 8))
+	y = np.random.randn(8)
+	y[4] = np.nan
+	with pytest.raises(ValueError):
+		lagrange_roots(basis.nodes, basis.weights, y, deflate)
+
+	# A zero polynomial (or zero weights) would produce NaNs when normalizing
+	with pytest.raises(ValueError):
+		lagrange_roots(basis.nodes, basis.weights, np.zeros(8), deflate)
+	with pytest.raises(ValueError):
+		lagrange_roots(basis.nodes, np.zeros(8), np.random.randn(8), deflate)
+
+
+@pytest.mark.parametrize("n", [2, 3, 4, 6])
+@pytest.mark.parametrize("complex_", [True, False])
+def test_deflation_small(n, complex_):
+	r""" Check the deflated pencil assembled from the packed Hessenberg factorization for small degrees
+	"""
+	np.random.seed(n)
+	X = np.random.randn(n)
+	y = np.random.randn(n)
+	if complex_:
+		X = X + 1j*np.random.randn(n)
+		y = y + 1j*np.random.randn(n)
+	basis = LagrangePolynomialBasis(X)
+	roots = basis.roots(y, deflation = True)
+	roots_full = basis.roots(y, deflation = False)
+	assert len(roots) == n - 1
+	err = sorted_norm(roots, roots_full, np.inf)
+	print(err)
+	assert err < 1e-8*max(1, np.max(np.abs(roots_full)))
+
+
+def test_prepare(monkeypatch):
+	import polyrat.lagrange
+	np.random.seed(0)
+	basis = LagrangePolynomialBasis(np.arange(10.))
+	X = np.random.randn(100)
+	X[0] = basis.nodes[3]
+	V = basis.vandermonde(X)
+	X2 = X + 1
+	V2 = basis.vandermonde(X2)
+	
+	basis.prepare(X)
+	assert basis._prepared[0] is X
+	
+	# Record whether the precomputed differences are passed on
+	vandermonde = polyrat.lagrange.lagrange_vandermonde
+	prepared = []
+	def spy(nodes, weights, X, dX = None, out = None):
+		prepared.append(dX is not None)
+		return vandermonde(nodes, weights, X, dX = dX, out = out)
+	monkeypatch.setattr(polyrat.lagrange, 'lagrange_vandermonde', spy)
+
+	assert np.allclose(V, basis.vandermonde(X))
+	assert prepared == [True]
+	# A different array must not reuse the prepared differences
+	assert np.allclose(V2, basis.vandermonde(X2))
+	assert prepared == [True, False]
+
+
+@pytest.mark.parametrize("complex_", [True, False])
+def test_vandermonde_paths(complex_, monkeypatch):
+	r""" The Numba kernel and the NumPy fallback agree, with and without prepared differences
+	"""
+	import polyrat.lagrange
+	np.random.seed(0)
+	nodes = np.cos(np.pi*np.arange(11)/10)
+	X = np.random.uniform(-1, 1, 50)
+	if complex_:
+		nodes = nodes + 0.1j*np.sin(np.pi*np.arange(11)/10)
+		X = X + 0.1j*np.random.randn(50)
+	X[[0, 7]] = nodes[[2, 5]]
+	basis = LagrangePolynomialBasis(nodes)
+	dX = X[:,None] - basis.nodes
+
+	Vs = []
+	for has_numba in [polyrat.lagrange._has_numba, False]:
+		monkeypatch.setattr(polyrat.lagrange, '_has_numba', has_numba)
+		Vs.append(lagrange_vandermonde(basis.nodes, basis.weights, X))
+		Vs.append(lagrange_vandermonde(basis.nodes, basis.weights, X, dX = dX))
+
+	for V in Vs[1:]:
+		assert np.allclose(Vs[0], V, rtol = 1e-12, atol = 1e-14)
+	assert np.all(Vs[0][0] == np.eye(11)[2])
+	assert np.all(Vs[1][7] == np.eye(11)[5])
+
+
+def test_vandermonde_workspace():
+	r""" Evaluating at more inputs than are cached recycles the evicted Vandermonde buffer
+	"""
+	np.random.seed(0)
+	X = np.cos(np.pi*np.arange(21)/20)
+	lpi = LagrangePolynomialInterpolant(X, np.cos(X))
+
+	Xhats = [np.random.uniform(-1, 1, 50) for i in range(2*lpi._vandermonde_cache_size)]
+	for Xhat in Xhats:
+		cache = getattr(lpi, '_vandermonde_cache', {})
+		V_old = next(iter(cache.values()))[-1] if cache else None
+		fX = lpi(Xhat)
+		err = np.max(np.abs(fX - np.cos(Xhat)))
+		assert err < 1e-12, "Error in evaluating with a recycled buffer"
+	# The buffer of the oldest entry has been reused for the newest
+	assert lpi._vandermonde_cache[next(reversed(lpi._vandermonde_cache))][-1] is V_old
+
+	out = np.zeros(50)
+	lpi.eval(Xhats[0], out = out)
+	assert np.allclose(out, np.cos(Xhats[0]))
+
 
 if __name__ == '__main__':
 	test_wilkinson(20, 1, True)
@@ -114,7 +114,45 @@ def test_derivative(Basis, dim, output_dim):
 
 
 
+def test_vandermonde_cache():
+	from copy import deepcopy
+	np.random.seed(0)
+	X = np.random.randn(100, 1)
+	y = np.cos(X).flatten()
+	poly = PolynomialApproximation(5, Basis = LegendrePolynomialBasis)
+	poly.fit(X, y)
+
+	Xhat = np.random.randn(20, 1)
+	fX = poly(Xhat)
+	V = poly._vandermonde(Xhat)
+	assert poly._vandermonde(Xhat) is V
+	assert np.all(fX == poly(Xhat))
+
+	# Modifying X in-place must not return the cached result
+	Xhat += 0.5
+	assert np.allclose(poly(Xhat), poly.basis.vandermonde(Xhat) @ poly.coef)
+	assert not np.allclose(fX, poly(Xhat))
+	Xhat -= 0.5
+	assert np.allclose(fX, poly(Xhat))
+	V = poly._vandermonde(Xhat)
+
+	# Copies must not carry over entries keyed on the ids of the original arrays
+	poly2 = deepcopy(poly)
+	assert not hasattr(poly2, '_vandermonde_cache')
+	assert np.allclose(fX, poly2(Xhat))
+
+	# Evaluating at more inputs than the cache holds evicts the oldest entry
+	for k in range(poly._vandermonde_cache_size):
+		poly(np.random.randn(10, 1))
+	assert len(poly._vandermonde_cache) == poly._vandermonde_cache_size
+	assert poly._vandermonde(Xhat) is not V
+	assert np.allclose(fX, poly(Xhat))
+
+	# Refitting replaces the basis, so the cached matrix must not be reused
+	poly.fit(X, np.sin(X).flatten())
+	assert np.allclose(poly(Xhat), poly.basis.vandermonde(Xhat) @ poly.coef)
+
+
 if __name__ == '__main__':
 	#test_approx(True, None, 1)
 	test_derivative(MonomialPolynomialBasis,2, (2,1))
-	 
@@ -1,4 +1,5 @@
 import numpy as np
+from functools import lru_cache
 from polyrat import *
 from polyrat.rational_ratio import _rational_residual_real, _rational_jacobian_real
 from polyrat.rational_ratio import _rational_residual_complex, _rational_jacobian_complex
@@ -67,6 +68,23 @@ def test_rational_jacobian_complex_arnoldi():
 
 
 
+@lru_cache(maxsize = None)
+def _cached_random_data(M, dim, complex_, seed):
+	r""" Test data shared between the parameterized Jacobian tests 
+	"""
+	X, y = random_data(M, dim, complex_, seed)
+	X.flags.writeable = False
+	y.flags.writeable = False
+	return X, y
+
+@lru_cache(maxsize = None)
+def _cached_legendre_vandermonde(M, dim, complex_, seed, degree):
+	X, y = _cached_random_data(M, dim, complex_, seed)
+	V = LegendrePolynomialBasis(X, degree).vandermonde_X
+	V.flags.writeable = False
+	return V
+
+
 @pytest.mark.parametrize("M", [500])
 @pytest.mark.parametrize("dim", [1,2,3])
 @pytest.mark.parametrize("num_degree", [4, 7])
@@ -75,17 +93,19 @@ def test_rational_jacobian_complex_arnoldi():
 @pytest.mark.parametrize("seed", [0])
 def test_rational_jacobian(M, dim, num_degree, denom_degree, complex_, seed):
 	
-	X, y = random_data(M, dim, complex_, seed)
+	X, y = _cached_random_data(M, dim, complex_, seed)
 
-	P = LegendrePolynomialBasis(X, num_degree).vandermonde_X
-	Q = LegendrePolynomialBasis(X, denom_degree).vandermonde_X
+	P = _cached_legendre_vandermonde(M, dim, complex_, seed, num_degree)
+	Q = _cached_legendre_vandermonde(M, dim, complex_, seed, denom_degree)
 
-	x0 = np.random.randn(P.shape[1]+Q.shape[1])
+	# Use a local generator so the starting point does not depend on test order
+	rng = np.random.RandomState(seed)
+	x0 = rng.randn(P.shape[1]+Q.shape[1])
 
 	if complex_:
 		res = lambda x: _rational_residual_complex(x, P, Q, y)
 		jac = lambda x: _rational_jacobian_complex(x, P, Q)
-		x0 = x0 + 1j*np.random.randn(P.shape[1]+Q.shape[1])
+		x0 = x0 + 1j*rng.randn(P.shape[1]+Q.shape[1])
 	else:	
 		res = lambda x: _rational_residual_real(x, P, Q, y)
 		jac = lambda x: _rational_jacobian_real(x, P, Q)